@@ -2,5 +2,45 @@
 
 __version__ = "0.4.0"
 from .constants import *
-from .generator import *
-from .utils import *
+from . import constants as _constants
+
+# The public API of the generator and utils modules is imported lazily, on first access, so that the command line
+# interface only loads the modules that the selected command actually needs.
+_LAZY_MODULES = {
+    "generator": ["chars", "words"],
+    "utils": [
+        "clean_word_list",
+        "permutations",
+        "calculate_entropy",
+        "calculate_entropy_batch",
+        "load_word_list",
+        "cached_load_word_list",
+        "iter_password_file",
+        "secure_random",
+        "secure_random_quality",
+        "RngQuality",
+    ],
+}
+_LAZY_NAMES = {
+    name: module_name for module_name, names in _LAZY_MODULES.items() for name in names
+}
+
+__all__ = list(_constants.__all__) + list(_LAZY_NAMES)
+
+
+def __getattr__(name):
+    import importlib
+
+    if name in _LAZY_MODULES:
+        # the submodules themselves (importing them also binds them in this module's namespace)
+        return importlib.import_module("." + name, __name__)
+    if name not in _LAZY_NAMES:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    value = getattr(importlib.import_module("." + _LAZY_NAMES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_MODULES) | set(_LAZY_NAMES))
@@ -1,67 +1,131 @@
 # -*- coding: utf-8 -*-
 
+from __future__ import annotations
+
 import sys
-from getpass import getpass
-import argparse
-import pyperclip
+from itertools import islice
+from types import SimpleNamespace
+
+# only true for static type checkers, which recognise the name; importing typing.TYPE_CHECKING would import typing
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Optional
 
-from .generator import *
-from .utils import *
-from .constants import *
+from .constants import (
+    DEFAULT_CHAR_PASSWORD_LENGTH,
+    DEFAULT_WORD_PASSWORD_WORDS,
+    ENTROPY_BATCH_SIZE,
+    PASSWORD_CHARSET_IDS,
+    PASSWORD_CHARSET_LABELS,
+    PASSWORD_SEPARATOR_IDS,
+    PASSWORD_SEPARATORS,
+    PC_DICT,
+    SEP_DASH,
+)
 from . import __version__
 
+NOT_IN_CHARSET = "not in character set"
+
+# help text shared between subparsers or formatted with defaults, built once at import time
+_HELP_DICTIONARY = "Path to the dictionary file to use. This must be a plain text file with one word per line."
+_HELP_ENCODING = (
+    "The encoding to use when read/writing input/output files. "
+    + "(See https://docs.python.org/2/library/codecs.html#standard-encodings)"
+)
+_HELP_GENERATE_LENGTH = (
+    "The default number of characters or words to generate, depending on which kind of password "
+    + "is being generated (a character- or dictionary-based one). Defaults: %d characters or %d words."
+) % (DEFAULT_CHAR_PASSWORD_LENGTH, DEFAULT_WORD_PASSWORD_WORDS)
+_HELP_GENERATE_SEPARATOR = (
+    "The separator to use when generating passwords from dictionaries (default=%s)."
+    % SEP_DASH
+)
+_HELP_GENERATE_CHARSET = (
+    'Which character set/approach to use when generating the password (default="%s"). See the '
+    + "README.md file at https://github.com/thanethomson/passwdgen for more details."
+) % PC_DICT
+
 
-def show_password_entropy(passwd, word_list):
-    """Displays the password entropy calculation results."""
-    entropy = calculate_entropy(passwd, dict_set=word_list)
+def print_password_entropy(passwd, entropy):
+    """Displays the given, already calculated, password entropy results."""
     print("\nPassword length: %d characters" % len(passwd))
     print("\nEntropy")
     print("-------")
-    for charset, charset_name in list(PASSWORD_CHARSET_NAMES):
-        print(
-            ("{:<%d}" % LONGEST_CHARSET_NAME_LEN).format(charset_name)
+    # emit the whole table in one call
+    print(
+        "\n".join(
+            label
             + " : "
-            + (
-                ("%.6f" % entropy[charset])
-                if charset in entropy
-                else "not in character set"
-            )
+            + (("%.6f" % entropy[charset]) if charset in entropy else NOT_IN_CHARSET)
+            for charset, label in PASSWORD_CHARSET_LABELS
         )
+    )
     print("")
 
 
-def main():
-    """Main routine for handling command line functionality for passwdgen."""
+def show_password_entropy(passwd: str, word_list: Optional[Iterable[str]]) -> None:
+    """Displays the password entropy calculation results. The word list is converted to a frozenset if it is not
+    already a set, so that dictionary lookups are constant-time.
+    """
+    from .utils import calculate_entropy
 
-    parser = argparse.ArgumentParser(
-        description="A password generation utility (v%s)." % __version__
-    )
-    subparsers = parser.add_subparsers(help="The command to execute.", dest="command")
+    if word_list is not None and not isinstance(word_list, (set, frozenset)):
+        word_list = frozenset(word_list)
+    print_password_entropy(passwd, calculate_entropy(passwd, dict_set=word_list))
 
-    parser_info = subparsers.add_parser(
-        "info",
-        help=(
-            "Compute information about a password. If passwdgen has input piped into it via stdin, that "
-            + "will be interpreted as the password."
-        ),
-    )
-    parser_info.add_argument(
+
+def show_password_entropy_batch(passwords, word_list, start=1):
+    """Displays the password entropy calculation results for many passwords, under numbered headings. The
+    entropies are calculated in bulk (see utils.calculate_entropy_batch).
+
+    Args:
+        passwords: A sequence of passwords.
+        word_list: The set of words in the dictionary.
+        start: The number of the first password, for the headings.
+    """
+    from .utils import calculate_entropy_batch
+
+    entropies = calculate_entropy_batch(passwords, dict_set=word_list)
+    for i, (passwd, entropy) in enumerate(zip(passwords, entropies), start):
+        heading = "Password %d" % i
+        print(heading)
+        print("=" * len(heading))
+        print_password_entropy(passwd, entropy)
+
+
+def add_dictionary_argument(parser):
+    """Attaches the shared dictionary file option to the given parser."""
+    parser.add_argument(
         "-d",
         "--dictionary",
         default=None,
-        help="Path to the dictionary file to use. This must be a plain text file with one word per line.",
+        help=_HELP_DICTIONARY,
     )
-    parser_info.add_argument(
+
+
+def add_encoding_argument(parser):
+    """Attaches the shared file encoding option to the given parser."""
+    parser.add_argument(
         "-e",
         "--encoding",
         default=None,
-        help=(
-            "The encoding to use when read/writing input/output files. "
-            + "(See https://docs.python.org/2/library/codecs.html#standard-encodings)"
-        ),
+        help=_HELP_ENCODING,
+    )
+
+
+def build_info_parser(parser_info):
+    add_dictionary_argument(parser_info)
+    add_encoding_argument(parser_info)
+    parser_info.add_argument(
+        "-f",
+        "--password-file",
+        default=None,
+        help="Path to a file containing passwords to check, one per line, instead of reading a single password.",
     )
 
-    parser_generate = subparsers.add_parser("generate", help="Generate password(s).")
+
+def build_generate_parser(parser_generate):
     parser_generate.add_argument(
         "-c",
         "--clipboard",
@@ -71,21 +135,8 @@ def main():
             + "writing the password to stdout"
         ),
     )
-    parser_generate.add_argument(
-        "-d",
-        "--dictionary",
-        default=None,
-        help="Path to the dictionary file to use. This must be a plain text file with one word per line.",
-    )
-    parser_generate.add_argument(
-        "-e",
-        "--encoding",
-        default=None,
-        help=(
-            "The encoding to use when read/writing input/output files. "
-            + "(See https://docs.python.org/2/library/codecs.html#standard-encodings)"
-        ),
-    )
+    add_dictionary_argument(parser_generate)
+    add_encoding_argument(parser_generate)
     parser_generate.add_argument(
         "-i",
         "--info",
@@ -97,11 +148,7 @@ def main():
         "--length",
         type=int,
         default=None,
-        help=(
-            "The default number of characters or words to generate, depending on which kind of password "
-            + "is being generated (a character- or dictionary-based one). Defaults: %d characters or %d words."
-        )
-        % (DEFAULT_CHAR_PASSWORD_LENGTH, DEFAULT_WORD_PASSWORD_WORDS),
+        help=_HELP_GENERATE_LENGTH,
     )
     parser_generate.add_argument(
         "-m",
@@ -115,10 +162,7 @@ def main():
         "--separator",
         choices=PASSWORD_SEPARATOR_IDS,
         default=SEP_DASH,
-        help=(
-            "The separator to use when generating passwords from dictionaries (default=%s)."
-        )
-        % SEP_DASH,
+        help=_HELP_GENERATE_SEPARATOR,
     )
     parser_generate.add_argument(
         "--starting-letters",
@@ -130,17 +174,11 @@ def main():
         "--charset",
         choices=PASSWORD_CHARSET_IDS,
         default=PC_DICT,
-        help=(
-            'Which character set/approach to use when generating the password (default="%s"). See the '
-            + "README.md file at https://github.com/thanethomson/passwdgen for more details."
-        )
-        % PC_DICT,
+        help=_HELP_GENERATE_CHARSET,
     )
 
-    parser_rng = subparsers.add_parser(
-        "rng",
-        help="Test the quality of the operating system's random number generator.",
-    )
+
+def build_rng_parser(parser_rng):
     parser_rng.add_argument(
         "-s",
         "--sample-size",
@@ -149,11 +187,12 @@ def main():
         help="Define the sample size to test with (default = 1,000,000).",
     )
 
-    subparsers.add_parser("version", help="Display the version of passwdgen and exit.")
 
-    parser_wordlist = subparsers.add_parser(
-        "wordlist", help="Utilities relating to word list manipulation."
-    )
+def build_version_parser(parser_version):
+    pass
+
+
+def build_wordlist_parser(parser_wordlist):
     subparsers_wordlist = parser_wordlist.add_subparsers(dest="wordlist_subcommand")
 
     parser_wordlist_clean = subparsers_wordlist.add_parser(
@@ -166,59 +205,297 @@ def main():
     parser_wordlist_clean.add_argument(
         "output_file", help="The output file into which to write the cleaned word list."
     )
-    parser_wordlist_clean.add_argument(
-        "-e",
-        "--encoding",
-        default=None,
-        help=(
-            "The encoding to use when read/writing input/output files. "
-            + "(See https://docs.python.org/2/library/codecs.html#standard-encodings)"
+    add_encoding_argument(parser_wordlist_clean)
+
+
+# subcommand help text and argument builders, in the order in which they appear in the top-level help
+SUBPARSER_BUILDERS = {
+    "info": (
+        (
+            "Compute information about a password. If passwdgen has input piped into it via stdin, that "
+            + "will be interpreted as the password."
         ),
+        build_info_parser,
+    ),
+    "generate": ("Generate password(s).", build_generate_parser),
+    "rng": (
+        "Test the quality of the operating system's random number generator.",
+        build_rng_parser,
+    ),
+    "version": ("Display the version of passwdgen and exit.", build_version_parser),
+    "wordlist": (
+        "Utilities relating to word list manipulation.",
+        build_wordlist_parser,
+    ),
+}
+
+
+def build_parser(argv):
+    """Builds the argument parser for the given command line arguments. Every command is registered, so that
+    top-level usage and error messages list all of them, but only the selected command's arguments are added;
+    if no known command has been selected (e.g. when requesting top-level help), all of them are populated.
+
+    Args:
+        argv: The command line arguments, excluding the program name.
+
+    Returns:
+        The configured argparse.ArgumentParser instance.
+    """
+    # only imported here, as the common invocations are handled by fast_parse without argparse
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="A password generation utility (v%s)." % __version__
     )
+    subparsers = parser.add_subparsers(help="The command to execute.", dest="command")
+
+    command = argv[0] if argv else None
+    for name, (help_text, build_subparser) in SUBPARSER_BUILDERS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        if command not in SUBPARSER_BUILDERS or command == name:
+            build_subparser(subparser)
+
+    return parser
 
-    args = parser.parse_args()
+
+class FastParseError(Exception):
+    """Raised by fast_parse when the given arguments need to be handled by the full argparse parser."""
+
+
+_DICTIONARY_OPTIONS = {"-d": ("dictionary", str), "--dictionary": ("dictionary", str)}
+_ENCODING_OPTIONS = {"-e": ("encoding", str), "--encoding": ("encoding", str)}
+
+# The command line surface understood by fast_parse, which must be kept in sync with the argparse subparsers.
+# Maps (command, subcommand) to (subcommand destination, positional destinations, options, defaults). Each
+# option maps to its destination and either a type (str or int), a tuple of valid choices, or None for flags.
+FAST_PARSE_COMMANDS = {
+    ("info", None): (
+        None,
+        (),
+        {
+            **_DICTIONARY_OPTIONS,
+            **_ENCODING_OPTIONS,
+            "-f": ("password_file", str),
+            "--password-file": ("password_file", str),
+        },
+        {"dictionary": None, "encoding": None, "password_file": None},
+    ),
+    ("generate", None): (
+        None,
+        (),
+        {
+            "-c": ("clipboard", None),
+            "--clipboard": ("clipboard", None),
+            **_DICTIONARY_OPTIONS,
+            **_ENCODING_OPTIONS,
+            "-i": ("info", None),
+            "--info": ("info", None),
+            "-l": ("length", int),
+            "--length": ("length", int),
+            "-m": ("min_entropy", int),
+            "--min-entropy": ("min_entropy", int),
+            "-s": ("separator", tuple(PASSWORD_SEPARATOR_IDS)),
+            "--separator": ("separator", tuple(PASSWORD_SEPARATOR_IDS)),
+            "--starting-letters": ("starting_letters", str),
+            "-t": ("charset", tuple(PASSWORD_CHARSET_IDS)),
+            "--charset": ("charset", tuple(PASSWORD_CHARSET_IDS)),
+        },
+        {
+            "clipboard": False,
+            "dictionary": None,
+            "encoding": None,
+            "info": False,
+            "length": None,
+            "min_entropy": None,
+            "separator": SEP_DASH,
+            "starting_letters": None,
+            "charset": PC_DICT,
+        },
+    ),
+    ("rng", None): (
+        None,
+        (),
+        {"-s": ("sample_size", int), "--sample-size": ("sample_size", int)},
+        {"sample_size": 1000000},
+    ),
+    ("version", None): (None, (), {}, {}),
+    ("wordlist", "clean"): (
+        "wordlist_subcommand",
+        ("input_file", "output_file"),
+        dict(_ENCODING_OPTIONS),
+        {"encoding": None},
+    ),
+}
+
+
+def fast_parse(argv):
+    """Parses common command line invocations without constructing an argparse parser. Anything out of the
+    ordinary (help requests, unknown or malformed options, invalid values, etc.) results in a FastParseError,
+    in which case the arguments should be parsed using the parser from build_parser, which will produce the
+    appropriate help or error output.
+
+    Args:
+        argv: The command line arguments, excluding the program name.
+
+    Returns:
+        A namespace containing the same attributes as would have been produced by argparse.
+
+    Raises:
+        FastParseError: If the arguments cannot be handled by the fast parser.
+    """
+    if not argv:
+        raise FastParseError()
+    command, tokens = argv[0], argv[1:]
+    spec = FAST_PARSE_COMMANDS.get((command, None))
+    if spec is None and tokens:
+        spec = FAST_PARSE_COMMANDS.get((command, tokens[0]))
+        subcommand, tokens = tokens[0], tokens[1:]
+    if spec is None:
+        raise FastParseError()
+    subcommand_dest, positional_dests, options, defaults = spec
+
+    result = dict(defaults, command=command)
+    if subcommand_dest is not None:
+        result[subcommand_dest] = subcommand
+    positionals = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+        if not token.startswith("-"):
+            positionals.append(token)
+            continue
+
+        option, has_value, value = token.partition("=")
+        if option not in options or (has_value and not option.startswith("--")):
+            raise FastParseError()
+        dest, kind = options[option]
+        if kind is None:
+            if has_value:
+                raise FastParseError()
+            result[dest] = True
+            continue
+
+        if not has_value:
+            if i == len(tokens) or tokens[i].startswith("-"):
+                raise FastParseError()
+            value = tokens[i]
+            i += 1
+        if kind is int:
+            try:
+                value = int(value)
+            except ValueError:
+                raise FastParseError()
+        elif isinstance(kind, tuple) and value not in kind:
+            raise FastParseError()
+        result[dest] = value
+
+    if len(positionals) != len(positional_dests):
+        raise FastParseError()
+    result.update(zip(positional_dests, positionals))
+    return SimpleNamespace(**result)
+
+
+def main() -> None:
+    """Main routine for handling command line functionality for passwdgen."""
+
+    argv = sys.argv[1:]
+    try:
+        args = fast_parse(argv)
+    except FastParseError:
+        args = build_parser(argv).parse_args(argv)
 
     if args.command == "version":
         print("passwdgen v%s" % __version__)
 
     elif args.command == "info":
-        if sys.stdin.isatty():
-            passwd = getpass("Please enter the password to check: ")
+        from .utils import cached_load_word_list
+
+        if args.password_file is not None:
+            from .utils import iter_password_file
+
+            try:
+                # load the dictionary once for all of the passwords in the file
+                word_list = cached_load_word_list(
+                    filename=args.dictionary, encoding=args.encoding
+                )
+                passwords = iter_password_file(
+                    args.password_file, encoding=args.encoding
+                )
+                # calculate the entropies in batches to bound memory usage for large files
+                count = 0
+                batch = list(islice(passwords, ENTROPY_BATCH_SIZE))
+                while batch:
+                    show_password_entropy_batch(batch, word_list, start=count + 1)
+                    count += len(batch)
+                    batch = list(islice(passwords, ENTROPY_BATCH_SIZE))
+
+            except (OSError, LookupError, ValueError) as e:
+                print("Error: %s" % e)
+
         else:
-            # if the input's been piped in
-            passwd = sys.stdin.read()
-            # strip off the single trailing newline
-            if passwd.endswith("\n"):
-                passwd = passwd[:-1]
+            if sys.stdin.isatty():
+                from getpass import getpass
 
-        word_list = load_word_list(filename=args.dictionary, encoding=args.encoding)
-        show_password_entropy(passwd, word_list)
+                passwd = getpass("Please enter the password to check: ")
+            else:
+                # if the input's been piped in, decode it (as stdin would, unless an encoding has been given)
+                # and then strip off the trailing newline
+                raw = sys.stdin.buffer.read()
+                try:
+                    passwd = raw.decode(
+                        args.encoding or sys.stdin.encoding or "utf-8",
+                        sys.stdin.errors or "strict",
+                    ).rstrip("\r\n")
+                except UnicodeError as e:
+                    print("Error: %s" % e)
+                    passwd = None
+
+            if passwd is not None:
+                word_list = cached_load_word_list(
+                    filename=args.dictionary, encoding=args.encoding
+                )
+                show_password_entropy(passwd, word_list)
 
     elif args.command == "rng":
-        print(
-            "Testing OS RNG. Attempting to generate %d samples between 0 and 100 (inclusive). Please wait..."
-            % args.sample_size
-        )
-        result = secure_random_quality(args.sample_size)
-        print("\nStatistics")
-        print("----------")
-        print(
-            "Mean               : %.6f (should approach %.3f as the sample size increases; %.3f%% difference)"
-            % (result["mean"], result["expected_mean"], result["mean_diff"])
-        )
-        print(
-            "Standard deviation : %.6f (should be as close to %.6f as possible; %.3f%% difference)"
-            % (result["stddev"], result["expected_stddev"], result["stddev_diff"])
-        )
-        print("Time taken         : %.3f seconds\n" % result["time"])
+        from .utils import secure_random_quality
+
+        if args.sample_size < 2:
+            print(
+                "Error: The sample size must be at least 2 (got %d)" % args.sample_size
+            )
+        else:
+            print(
+                "Testing OS RNG. Attempting to generate %d samples between 0 and 100 (inclusive). Please wait..."
+                % args.sample_size
+            )
+            result = secure_random_quality(args.sample_size)
+            print("\nStatistics")
+            print("----------")
+            print(
+                "Mean               : %.6f (should approach %.3f as the sample size increases; %.3f%% difference)"
+                % (result.mean, result.expected_mean, result.mean_diff)
+            )
+            print(
+                "Standard deviation : %.6f (should be as close to %.6f as possible; %.3f%% difference)"
+                % (result.stddev, result.expected_stddev, result.stddev_diff)
+            )
+            print("Time taken         : %.3f seconds\n" % result.time)
 
     elif args.command == "generate":
+        from .generator import chars, words
+        from .utils import cached_load_word_list
+
         try:
-            word_list = load_word_list(filename=args.dictionary, encoding=args.encoding)
+            # the word list is only needed for dictionary-based passwords or entropy info
+            word_list = None
 
             # dictionary-based password generation
             if args.charset == PC_DICT:
                 # load our dictionary
+                word_list = cached_load_word_list(
+                    filename=args.dictionary, encoding=args.encoding
+                )
                 passwd = words(
                     word_list,
                     separator=PASSWORD_SEPARATORS[args.separator],
@@ -232,12 +509,18 @@ def main():
                 )
 
             if args.clipboard:
+                import pyperclip
+
                 pyperclip.copy(passwd)
                 print("Password copied to clipboard.")
             else:
                 print(passwd)
 
             if args.info:
+                if word_list is None:
+                    word_list = cached_load_word_list(
+                        filename=args.dictionary, encoding=args.encoding
+                    )
                 show_password_entropy(passwd, word_list)
 
         except ValueError as e:
@@ -245,6 +528,8 @@ def main():
 
     elif args.command == "wordlist":
         if args.wordlist_subcommand == "clean":
+            from .utils import clean_word_list
+
             print("Attempting to clean word list: %s" % args.input_file)
             result = clean_word_list(
                 args.input_file, args.output_file, encoding=args.encoding
@@ -27,10 +27,15 @@ __all__ = [
     "PASSWORD_CHARSET_NAMES",
     "PASSWORD_CHARSET_IDS",
     "LONGEST_CHARSET_NAME_LEN",
+    "PASSWORD_CHARSET_LABELS",
     "DEFAULT_WORD_LIST",
     "DEFAULT_CHAR_PASSWORD_LENGTH",
     "DEFAULT_WORD_PASSWORD_WORDS",
     "DEFAULT_MIN_WORD_LEN",
+    "DEFAULT_WORD_LIST_BUFFER_SIZE",
+    "WORD_LIST_WRITE_BATCH_SIZE",
+    "ENTROPY_BATCH_SIZE",
+    "RNG_QUALITY_CHUNK_SIZE",
     "MIN_DICT_SIZE",
     "DEFAULT_WORD_SEPARATOR",
 ]
@@ -116,6 +121,10 @@ PASSWORD_CHARSET_NAMES = (
 
 PASSWORD_CHARSET_IDS = [_id for _id, _ in PASSWORD_CHARSET_NAMES]
 LONGEST_CHARSET_NAME_LEN = max([len(name) for _, name in list(PASSWORD_CHARSET_NAMES)])
+# charset names padded for display in a table
+PASSWORD_CHARSET_LABELS = tuple(
+    (_id, name.ljust(LONGEST_CHARSET_NAME_LEN)) for _id, name in PASSWORD_CHARSET_NAMES
+)
 
 DEFAULT_CHARSET = PC_SPECIAL
 DEFAULT_WORD_LIST = "data/default-word-list.txt"
@@ -124,5 +133,15 @@ DEFAULT_WORD_PASSWORD_WORDS = 4
 DEFAULT_WORD_SEPARATOR = "-"
 DEFAULT_MIN_WORD_LEN = 3
 
+# I/O buffer size (in bytes) and number of words per write when cleaning word lists
+DEFAULT_WORD_LIST_BUFFER_SIZE = 1 << 22
+WORD_LIST_WRITE_BATCH_SIZE = 10000
+
+# number of passwords whose entropy is calculated at once when checking a password file
+ENTROPY_BATCH_SIZE = 10000
+
+# number of random samples drawn at once when testing the quality of the RNG
+RNG_QUALITY_CHUNK_SIZE = 1000000
+
 # minimum number of words in a dictionary
 MIN_DICT_SIZE = 100
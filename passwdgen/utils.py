@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from collections import namedtuple
 from functools import reduce
 from operator import mul
 from string import ascii_lowercase
@@ -10,20 +11,61 @@ import os
 import struct
 import importlib.resources
 
-from .constants import *
+from .constants import (
+    DEFAULT_MIN_WORD_LEN,
+    DEFAULT_WORD_LIST,
+    DEFAULT_WORD_LIST_BUFFER_SIZE,
+    MIN_DICT_SIZE,
+    PASSWORD_CHARSETS,
+    PC_ALPHA_LOWER_SEP,
+    PC_DICT,
+    RNG_QUALITY_CHUNK_SIZE,
+    WORD_LIST_WRITE_BATCH_SIZE,
+    separators,
+)
 
 
 __all__ = [
     "clean_word_list",
     "permutations",
     "calculate_entropy",
+    "calculate_entropy_batch",
     "load_word_list",
+    "cached_load_word_list",
+    "iter_password_file",
     "secure_random",
     "secure_random_quality",
+    "RngQuality",
 ]
 
 
-def clean_word_list(input_path, output_path, encoding=None, min_word_len=None):
+# entropy (in bits) per character of each charset
+_CHARSET_BITS = {
+    charset_name: math.log(1.0 * len(charset), 2.0)
+    for charset_name, charset in PASSWORD_CHARSETS.items()
+}
+
+# (name, charset, names of the other charsets that are subsets of it), ordered from the largest charset to the
+# smallest, so that checking a password against a charset can rule out all of that charset's subsets
+_CHARSETS_BY_SIZE = tuple(
+    (
+        charset_name,
+        charset,
+        frozenset(
+            other_name
+            for other_name, other in PASSWORD_CHARSETS.items()
+            if other_name != charset_name and other.issubset(charset)
+        ),
+    )
+    for charset_name, charset in sorted(
+        PASSWORD_CHARSETS.items(), key=lambda item: len(item[1]), reverse=True
+    )
+)
+
+
+def clean_word_list(
+    input_path, output_path, encoding=None, min_word_len=None, buffer_size=None
+):
     """Cleans the given word list, ensuring no punctuation or capitalisation or duplicate words. Word lists
     must be plain text files, with one word per line, and sorted alphabetically.
 
@@ -32,16 +74,20 @@ def clean_word_list(input_path, output_path, encoding=None, min_word_len=None):
         output_path: The path to where to write the output, filtered word list.
         encoding: The encoding to use when attempting to read the file (default: platform-dependent).
         min_word_len: The minimum length of words to include. Defaults to constants.DEFAULT_MIN_WORD_LEN.
+        buffer_size: The size (in bytes) of the I/O buffers used for the input and output files. Defaults to
+            constants.DEFAULT_WORD_LIST_BUFFER_SIZE.
 
     Returns:
         A dictionary containing statistics about the clean operation.
     """
     if min_word_len is None:
         min_word_len = DEFAULT_MIN_WORD_LEN
+    if buffer_size is None:
+        buffer_size = DEFAULT_WORD_LIST_BUFFER_SIZE
     word_list = set()
     start_time = time.time()
     words_read = 0
-    with open(input_path, "rt", encoding=encoding) as input_file:
+    with open(input_path, "rt", buffering=buffer_size, encoding=encoding) as input_file:
         for line in input_file:
             word = line.strip().lower()
             if len(word) > 0:
@@ -60,9 +106,14 @@ def clean_word_list(input_path, output_path, encoding=None, min_word_len=None):
                 if stripped_word and len(stripped_word) >= min_word_len:
                     word_list.add(stripped_word)
 
-    with open(output_path, "wt", encoding=encoding) as output_file:
-        for word in sorted(list(word_list)):
-            output_file.write("%s\n" % word)
+    sorted_words = sorted(word_list)
+    with open(
+        output_path, "wt", buffering=buffer_size, encoding=encoding
+    ) as output_file:
+        # write the words out in batches rather than one at a time
+        for i in range(0, len(sorted_words), WORD_LIST_WRITE_BATCH_SIZE):
+            batch = sorted_words[i : i + WORD_LIST_WRITE_BATCH_SIZE]
+            output_file.write("\n".join(batch) + "\n")
 
     end_time = time.time()
     return {
@@ -91,7 +142,8 @@ def calculate_entropy(password, dict_set=None):
 
     Args:
         password: The source password to use in calculation.
-        dict_set: The set of words in our dictionary/word list.
+        dict_set: The set of words in our dictionary/word list. This should be a set or frozenset (as returned by
+            load_word_list), since each word of the password is looked up in it.
 
     Returns:
         A dictionary containing the entropies of the password based on different attacker dictionaries.
@@ -100,39 +152,118 @@ def calculate_entropy(password, dict_set=None):
     password_len = len(password)
     entropy = dict()
 
-    # find the charsets in which we'll find this password
-    for charset_name, charset in PASSWORD_CHARSETS.items():
+    # find the charsets in which we'll find this password, from the largest to the smallest
+    excluded = set()
+    for charset_name, charset, charset_subsets in _CHARSETS_BY_SIZE:
+        if charset_name in excluded:
+            continue
         if password_letters.issubset(charset):
-            entropy[charset_name] = math.log(1.0 * len(charset), 2.0) * password_len
+            entropy[charset_name] = _CHARSET_BITS[charset_name] * password_len
+        else:
+            # if the password isn't in this charset, it can't be in any of its subsets either
+            excluded.update(charset_subsets)
 
     if dict_set is not None:
         # we assume our dictionary words are all lowercase, and that our separator is used
         if password_letters.issubset(PASSWORD_CHARSETS[PC_ALPHA_LOWER_SEP]):
-            # detect the separator
-            sep = None
-            for c in password_letters:
-                if c in separators:
-                    sep = c
-                    break
-
-            # split the words by separator
-            words = password.split(sep) if sep is not None else [password]
-            # only if the words are unique to each other
-            if len(words) == len(set(words)):
-                all_words_found = True
-                for word in words:
-                    if word not in dict_set:
-                        all_words_found = False
-
-                # only if all of the words in the password are in our specific dictionary
-                if all_words_found:
-                    entropy[PC_DICT] = math.log(
-                        permutations(len(dict_set), len(words)), 2.0
-                    )
+            words = _dictionary_words(password, password_letters, dict_set)
+            if words is not None:
+                entropy[PC_DICT] = math.log(
+                    permutations(len(dict_set), len(words)), 2.0
+                )
 
     return entropy
 
 
+def _dictionary_words(password, password_letters, dict_set):
+    """Splits the given password (assumed to only contain lowercase letters and separators) into its words, if
+    it is made up of unique words from the dictionary. Otherwise returns None.
+    """
+    # detect the separator
+    sep = None
+    for c in password_letters:
+        if c in separators:
+            sep = c
+            break
+
+    # split the words by separator
+    words = password.split(sep) if sep is not None else [password]
+    # only if the words are unique to each other
+    if len(words) == len(set(words)):
+        # only if all of the words in the password are in our specific dictionary
+        if all(word in dict_set for word in words):
+            return words
+    return None
+
+
+def calculate_entropy_batch(passwords, dict_set=None):
+    """Calculates the entropies of many passwords at once, as per calculate_entropy. If NumPy is installed, the
+    character set membership of all of the passwords is determined in bulk using a byte lookup table, otherwise
+    each password's entropy is calculated individually.
+
+    Args:
+        passwords: A sequence of the passwords to use in calculation.
+        dict_set: The set of words in our dictionary/word list (see calculate_entropy).
+
+    Returns:
+        A list containing a dictionary of entropies (as returned by calculate_entropy) for each password.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return [
+            calculate_entropy(password, dict_set=dict_set) for password in passwords
+        ]
+
+    charset_names = list(PASSWORD_CHARSETS)
+    # bit i of each byte's entry is set if that byte is in charset i; all of our charsets are ASCII, so any
+    # (UTF-8 encoded) non-ASCII byte excludes every charset
+    lut = np.zeros(256, dtype=np.uint16)
+    for i, charset_name in enumerate(charset_names):
+        for c in PASSWORD_CHARSETS[charset_name]:
+            lut[ord(c)] |= 1 << i
+    all_charsets = (1 << len(charset_names)) - 1
+
+    # AND together the lookup entries of each password's bytes (empty passwords are in every charset)
+    encoded = [password.encode("utf-8") for password in passwords]
+    byte_lens = np.array([len(e) for e in encoded], dtype=np.intp)
+    data = lut[np.frombuffer(b"".join(encoded), dtype=np.uint8)]
+    masks = np.full(len(passwords), all_charsets, dtype=np.uint16)
+    non_empty = byte_lens > 0
+    if data.size:
+        starts = (np.cumsum(byte_lens) - byte_lens)[non_empty]
+        masks[non_empty] = np.bitwise_and.reduceat(data, starts)
+
+    charset_bits = [
+        (1 << i, charset_name, _CHARSET_BITS[charset_name])
+        for i, charset_name in enumerate(charset_names)
+    ]
+    alpha_lower_sep_bit = 1 << charset_names.index(PC_ALPHA_LOWER_SEP)
+    dict_entropies = dict()
+
+    entropies = []
+    for password, mask in zip(passwords, masks.tolist()):
+        password_len = len(password)
+        entropy = {
+            charset_name: bits * password_len
+            for bit, charset_name, bits in charset_bits
+            if mask & bit
+        }
+        if dict_set is not None and mask & alpha_lower_sep_bit:
+            words = _dictionary_words(password, set(password), dict_set)
+            if words is not None:
+                # the dictionary entropy only depends on the number of words
+                word_count = len(words)
+                if word_count not in dict_entropies:
+                    dict_entropies[word_count] = math.log(
+                        permutations(len(dict_set), word_count), 2.0
+                    )
+                entropy[PC_DICT] = dict_entropies[word_count]
+        entropies.append(entropy)
+
+    return entropies
+
+
 def load_word_list(filename=None, resource=None, encoding=None):
     """Loads a word list from the given filename or resource.
 
@@ -143,7 +274,7 @@ def load_word_list(filename=None, resource=None, encoding=None):
         encoding: The encoding to use when reading the file (default: OS-dependent).
 
     Returns:
-        A set containing the entire list of non-zero-length words in the word list.
+        A frozenset containing the entire list of non-zero-length words in the word list.
     """
     words = set()
 
@@ -164,9 +295,139 @@ def load_word_list(filename=None, resource=None, encoding=None):
             % MIN_DICT_SIZE
         )
 
+    return frozenset(words)
+
+
+def word_list_cache_dir():
+    """Returns the directory in which passwdgen caches parsed word lists. This respects the XDG_CACHE_HOME
+    environment variable, defaulting to ~/.cache/passwdgen.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "passwdgen")
+
+
+def cached_load_word_list(filename=None, encoding=None, cache_dir=None):
+    """Loads a word list as per load_word_list, but caches the parsed result (using marshal) so that subsequent
+    loads of the same, unmodified file skip parsing it line by line. There is one cache file per word list path,
+    which records the modification time, size and encoding of the word list it was built from, and is replaced
+    whenever any of these change. The cache is best-effort: if it cannot be read or written, the word list is
+    simply loaded from the original file.
+
+    Args:
+        filename: If specified, loads the word list from this file system path. Otherwise the default word list
+            is used.
+        encoding: The encoding to use when reading the file (default: OS-dependent).
+        cache_dir: The directory in which to store cached word lists (default: see word_list_cache_dir).
+
+    Returns:
+        A frozenset containing the entire list of non-zero-length words in the word list.
+    """
+    import hashlib
+    import marshal
+    import tempfile
+
+    if filename is None:
+        filename = importlib.resources.files("passwdgen").joinpath(DEFAULT_WORD_LIST)
+    filename = os.path.abspath(filename)
+
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        # let load_word_list raise the appropriate error
+        return load_word_list(filename=filename, encoding=encoding)
+
+    cache_dir = cache_dir or word_list_cache_dir()
+    cache_path = os.path.join(
+        cache_dir, "%s.marshal" % hashlib.sha1(filename.encode("utf-8")).hexdigest()
+    )
+    source_info = (stat.st_mtime_ns, stat.st_size, encoding)
+
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached = marshal.loads(cache_file.read())
+        if (
+            isinstance(cached, tuple)
+            and len(cached) == 2
+            and cached[0] == source_info
+            and isinstance(cached[1], frozenset)
+        ):
+            return cached[1]
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    words = load_word_list(filename=filename, encoding=encoding)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first, so that readers never see a partially written cache file
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with open(fd, "wb") as cache_file:
+                marshal.dump((source_info, words), cache_file)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
+
     return words
 
 
+def iter_password_file(filename, encoding=None):
+    """Iterates through the passwords in the given file, one password per line. Regular files are memory-mapped
+    and read line by line, so even very large password files are not loaded into memory in their entirety.
+    Other files (e.g. pipes) are read line by line as a stream. Empty lines are skipped.
+
+    Args:
+        filename: The path to the file containing the passwords.
+        encoding: The encoding of the file (default: OS-dependent).
+
+    Returns:
+        A generator yielding each password in the file.
+    """
+    import codecs
+    import locale
+    import mmap
+    import stat
+
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    # resolve the codec once, up front, so that an unknown encoding raises a LookupError before any reading
+    encoding = codecs.lookup(encoding).name
+
+    # lines can only be split at the byte level if the encoding is ASCII-compatible (e.g. not UTF-16)
+    if "\n".encode(encoding) != b"\n":
+        with open(filename, "rt", encoding=encoding) as password_file:
+            for line in password_file:
+                line = line.rstrip("\r\n")
+                if line:
+                    yield line
+        return
+
+    with open(filename, "rb") as password_file:
+        st = os.fstat(password_file.fileno())
+        if not stat.S_ISREG(st.st_mode):
+            yield from _decode_password_lines(password_file, encoding)
+        # empty files cannot be memory-mapped
+        elif st.st_size > 0:
+            with mmap.mmap(
+                password_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as password_map:
+                yield from _decode_password_lines(
+                    iter(password_map.readline, b""), encoding
+                )
+
+
+def _decode_password_lines(lines, encoding):
+    """Decodes the non-empty lines from the given iterable of byte strings, stripping their line endings."""
+    for line in lines:
+        line = line.rstrip(b"\r\n")
+        if line:
+            yield line.decode(encoding)
+
+
 def secure_random(a, b=None):
     """Generates integers in the most secure manner possible provided by the operating system. On POSIX machines,
     this will use /dev/urandom. On Windows machines, this will use CryptGenRandom().
@@ -191,30 +452,59 @@ def secure_random(a, b=None):
     return (random_val % int(a)) if b is None else (int(a) + (random_val % int(b - a)))
 
 
+# statistics about the quality of the random number generator, as returned by secure_random_quality
+RngQuality = namedtuple(
+    "RngQuality",
+    "mean expected_mean mean_diff stddev expected_stddev stddev_diff time",
+)
+
+
 def secure_random_quality(sample_size=1000000):
-    """Attempts to estimate the quality of the secure random number generator of the operating system.
+    """Attempts to estimate the quality of the secure random number generator of the operating system. The
+    samples are drawn and tallied in chunks (see constants.RNG_QUALITY_CHUNK_SIZE), so memory usage does not grow
+    with the sample size. If NumPy is installed, each chunk is analysed using NumPy arrays, otherwise a pure
+    Python implementation is used.
 
     Args:
-        sample_size: The number of random samples to generate and test.
+        sample_size: The number of random samples to generate and test. Must be at least 2.
 
     Returns:
-        A dictionary containing some statistics about the random number generator.
+        An RngQuality tuple containing some statistics about the random number generator.
     """
+    if sample_size < 2:
+        raise ValueError("The sample size must be at least 2 (got %d)" % sample_size)
     start_time = time.time()
 
-    total = 0
-    counts = dict()
-    for i in range(sample_size):
-        rnd_val = secure_random(101)
-        total += rnd_val
-        counts[rnd_val] = (counts[rnd_val] + 1) if rnd_val in counts else 1
-
-    mean = float(total) / float(sample_size)
+    # the sizes of the chunks in which to draw the samples
+    chunk_sizes = [
+        min(RNG_QUALITY_CHUNK_SIZE, sample_size - i)
+        for i in range(0, sample_size, RNG_QUALITY_CHUNK_SIZE)
+    ]
+
+    # tally how many times each value occurs, reducing each 8-byte value modulo 101 as per secure_random
+    try:
+        import numpy as np
+    except ImportError:
+        counts = [0] * 101
+        for chunk_size in chunk_sizes:
+            for (random_val,) in struct.iter_unpack("Q", os.urandom(8 * chunk_size)):
+                counts[random_val % 101] += 1
+    else:
+        histogram = np.zeros(101, dtype=np.int64)
+        for chunk_size in chunk_sizes:
+            samples = np.frombuffer(os.urandom(8 * chunk_size), dtype=np.uint64) % 101
+            histogram += np.bincount(samples.astype(np.intp), minlength=101)
+        counts = histogram.tolist()
+
+    mean = float(sum(val * count for val, count in enumerate(counts))) / float(
+        sample_size
+    )
     # calculate the variance
     variance = 0.0
-    for val, count in counts.items():
+    for val, count in enumerate(counts):
         variance += ((val - mean) ** 2.0) * count
     variance /= float(sample_size) - 1.0
+
     # ensure variance is positive (sometimes zeros can be negative with floating point numbers)
     if variance < 0.0:
         variance *= -1.0
@@ -223,12 +513,12 @@ def secure_random_quality(sample_size=1000000):
     expected_stddev = math.sqrt(expected_variance)
 
     end_time = time.time()
-    return {
-        "mean": mean,
-        "expected_mean": 50.0,
-        "mean_diff": 100.0 * (abs(50.0 - mean) / 50.0),
-        "stddev": stddev,
-        "expected_stddev": expected_stddev,
-        "stddev_diff": 100.0 * (abs(expected_stddev - stddev) / expected_stddev),
-        "time": end_time - start_time,
-    }
+    return RngQuality(
+        mean=mean,
+        expected_mean=50.0,
+        mean_diff=100.0 * (abs(50.0 - mean) / 50.0),
+        stddev=stddev,
+        expected_stddev=expected_stddev,
+        stddev_diff=100.0 * (abs(expected_stddev - stddev) / expected_stddev),
+        time=end_time - start_time,
+    )
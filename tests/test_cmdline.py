@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from passwdgen.cmdline import FastParseError, build_parser, fast_parse
+
+
+class TestFastParse(unittest.TestCase):
+    def assertMatchesArgparse(self, argv):
+        expected = vars(build_parser(argv).parse_args(argv))
+        self.assertEqual(expected, vars(fast_parse(argv)))
+
+    def test_matches_argparse(self):
+        for argv in [
+            ["version"],
+            ["info"],
+            ["info", "-d", "words.txt", "--encoding", "utf-8"],
+            ["info", "-f", "passwords.txt"],
+            ["info", "--password-file=passwords.txt", "-e", "utf-8"],
+            ["generate"],
+            ["generate", "-c", "-i", "-l", "6", "-s", "colon"],
+            ["generate", "--charset=alpha-numeric", "--length=15", "--info"],
+            ["generate", "-m", "80", "--starting-letters", "hello", "-t", "dict"],
+            ["generate", "-l", "4", "-l", "5"],
+            ["rng"],
+            ["rng", "--sample-size", "1000"],
+            ["wordlist", "clean", "in.txt", "out.txt"],
+            ["wordlist", "clean", "-e", "latin-1", "in.txt", "out.txt"],
+        ]:
+            with self.subTest(argv=argv):
+                self.assertMatchesArgparse(argv)
+
+    def test_falls_back_to_argparse(self):
+        for argv in [
+            [],
+            ["-h"],
+            ["generate", "-h"],
+            ["unknown-command"],
+            ["generate", "--unknown"],
+            ["generate", "-ci"],
+            ["generate", "-l"],
+            ["generate", "-l", "six"],
+            ["generate", "-t", "unknown-charset"],
+            ["generate", "-c=1"],
+            ["generate", "extra"],
+            ["wordlist"],
+            ["wordlist", "clean", "in.txt"],
+        ]:
+            with self.subTest(argv=argv):
+                with self.assertRaises(FastParseError):
+                    fast_parse(argv)
+
+    def test_usage_lists_all_commands(self):
+        for argv in [[], ["generate"], ["wordlist", "clean"]]:
+            with self.subTest(argv=argv):
+                self.assertIn(
+                    "{info,generate,rng,version,wordlist}",
+                    build_parser(argv).format_usage(),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
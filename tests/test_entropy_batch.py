@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from passwdgen.generator import chars, words
+from passwdgen.constants import PASSWORD_CHARSETS
+from passwdgen.utils import calculate_entropy, calculate_entropy_batch, load_word_list
+
+
+class TestEntropyBatch(unittest.TestCase):
+    word_list = load_word_list()
+
+    def test_matches_calculate_entropy(self):
+        passwords = [
+            "",
+            "password",
+            "PASSWORD",
+            "Passw0rd!",
+            "correct horse",
+            "1234567890",
+            "pässwörd",
+            "tab\tseparated",
+        ]
+        passwords.extend(chars(charset_id) for charset_id in PASSWORD_CHARSETS)
+        passwords.extend(words(self.word_list) for _ in range(10))
+
+        for dict_set in (None, self.word_list):
+            expected = [calculate_entropy(pw, dict_set=dict_set) for pw in passwords]
+            self.assertEqual(
+                expected, calculate_entropy_batch(passwords, dict_set=dict_set)
+            )
+
+    def test_empty_batch(self):
+        self.assertEqual([], calculate_entropy_batch([], dict_set=self.word_list))
+
+
+if __name__ == "__main__":
+    unittest.main()
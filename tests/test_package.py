@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+import unittest
+
+import passwdgen
+from passwdgen import constants, generator, utils
+
+
+class TestPackageExports(unittest.TestCase):
+    def test_lazy_exports_match_modules(self):
+        self.assertEqual(generator.__all__, passwdgen._LAZY_MODULES["generator"])
+        self.assertEqual(utils.__all__, passwdgen._LAZY_MODULES["utils"])
+        for name in passwdgen.__all__:
+            with self.subTest(name=name):
+                self.assertTrue(hasattr(passwdgen, name))
+
+    def test_submodule_access(self):
+        # run in a fresh interpreter, where the submodules have not been imported yet
+        code = (
+            "import passwdgen; "
+            "print(passwdgen.utils.__name__, passwdgen.generator.__name__)"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code], text=True)
+        self.assertEqual("passwdgen.utils passwdgen.generator", output.strip())
+        self.assertIs(utils, passwdgen.utils)
+        self.assertIs(generator, passwdgen.generator)
+
+    def test_constants_exported(self):
+        for name in constants.__all__:
+            self.assertIs(getattr(constants, name), getattr(passwdgen, name))
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            passwdgen.not_a_real_attribute
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import threading
+import unittest
+
+from passwdgen.utils import iter_password_file
+
+
+class TestPasswordFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.password_file_path = os.path.join(self.temp_dir.name, "passwords.txt")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_password_file(self, content):
+        with open(self.password_file_path, "wb") as f:
+            f.write(content)
+
+    def test_passwords_read_line_by_line(self):
+        self.write_password_file(b"first-password\r\n\nsecond\nno-trailing-newline")
+        self.assertEqual(
+            ["first-password", "second", "no-trailing-newline"],
+            list(iter_password_file(self.password_file_path, encoding="utf-8")),
+        )
+
+    def test_unknown_encoding(self):
+        self.write_password_file(b"password\n")
+        with self.assertRaises(LookupError):
+            list(iter_password_file(self.password_file_path, encoding="bogus"))
+
+    def test_encoding(self):
+        self.write_password_file("pässwörd\n".encode("latin-1"))
+        self.assertEqual(
+            ["pässwörd"],
+            list(iter_password_file(self.password_file_path, encoding="latin-1")),
+        )
+
+    def test_wide_encoding(self):
+        self.write_password_file("first\r\nsecond\n".encode("utf-16-le"))
+        self.assertEqual(
+            ["first", "second"],
+            list(iter_password_file(self.password_file_path, encoding="utf-16-le")),
+        )
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "requires named pipes")
+    def test_named_pipe(self):
+        fifo_path = os.path.join(self.temp_dir.name, "passwords.fifo")
+        os.mkfifo(fifo_path)
+
+        def write_passwords():
+            with open(fifo_path, "wb") as f:
+                f.write(b"first\nsecond\n")
+
+        writer = threading.Thread(target=write_passwords)
+        writer.start()
+        try:
+            self.assertEqual(
+                ["first", "second"],
+                list(iter_password_file(fifo_path, encoding="utf-8")),
+            )
+        finally:
+            writer.join()
+
+    def test_empty_file(self):
+        self.write_password_file(b"")
+        self.assertEqual([], list(iter_password_file(self.password_file_path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import unittest
-from passwdgen.utils import secure_random
+from passwdgen.utils import secure_random, secure_random_quality
 
 
 class TestSecureRNG(unittest.TestCase):
@@ -15,6 +15,17 @@ class TestSecureRNG(unittest.TestCase):
             random_val = secure_random(50, 100)
             self.assertTrue(50 <= random_val < 100)
 
+    def test_random_quality_statistics(self):
+        result = secure_random_quality(100000)
+        # with this sample size, both should be well within 5% of the expected values
+        self.assertLess(result.mean_diff, 5.0)
+        self.assertLess(result.stddev_diff, 5.0)
+
+    def test_random_quality_sample_size(self):
+        for sample_size in (-1, 0, 1):
+            with self.assertRaises(ValueError):
+                secure_random_quality(sample_size)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+
+from passwdgen.utils import cached_load_word_list, load_word_list
+
+
+class TestWordListCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.word_list_path = os.path.join(self.temp_dir.name, "words.txt")
+        self.write_word_list(["word%d" % i for i in range(200)])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_word_list(self, words):
+        with open(self.word_list_path, "wt", encoding="utf-8") as f:
+            f.write("\n".join(words) + "\n")
+
+    def test_cache_matches_uncached_load(self):
+        expected = load_word_list(filename=self.word_list_path, encoding="utf-8")
+        # the first load populates the cache, the second reads from it
+        for _ in range(2):
+            words = cached_load_word_list(
+                filename=self.word_list_path,
+                encoding="utf-8",
+                cache_dir=self.cache_dir,
+            )
+            self.assertIsInstance(words, frozenset)
+            self.assertEqual(expected, words)
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+    def test_modified_word_list_invalidates_cache(self):
+        cached_load_word_list(
+            filename=self.word_list_path, encoding="utf-8", cache_dir=self.cache_dir
+        )
+        self.write_word_list(["other%d" % i for i in range(300)])
+        # make sure the modification time changes, even on coarse-grained file systems
+        stat = os.stat(self.word_list_path)
+        os.utime(self.word_list_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        words = cached_load_word_list(
+            filename=self.word_list_path, encoding="utf-8", cache_dir=self.cache_dir
+        )
+        self.assertEqual(300, len(words))
+        self.assertIn("other0", words)
+        # the stale cache entry is replaced rather than left behind
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+    def test_corrupt_cache_is_ignored(self):
+        expected = cached_load_word_list(
+            filename=self.word_list_path, encoding="utf-8", cache_dir=self.cache_dir
+        )
+        (cache_file,) = os.listdir(self.cache_dir)
+        cache_path = os.path.join(self.cache_dir, cache_file)
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        # simulate a partially written cache file
+        with open(cache_path, "wb") as f:
+            f.write(data[: len(data) // 2])
+
+        words = cached_load_word_list(
+            filename=self.word_list_path, encoding="utf-8", cache_dir=self.cache_dir
+        )
+        self.assertEqual(expected, words)
+        # and the cache has been rewritten in full
+        with open(cache_path, "rb") as f:
+            self.assertEqual(data, f.read())
+
+    def test_default_word_list(self):
+        words = cached_load_word_list(cache_dir=self.cache_dir)
+        self.assertEqual(load_word_list(), words)
+
+
+if __name__ == "__main__":
+    unittest.main()